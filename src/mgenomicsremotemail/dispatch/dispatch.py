@@ -8,18 +8,26 @@ is completed. It is intended to be used as a remote ssh call by configuring a
 restricted ssh login for the head of the Core Facility.
 """
 from pathlib import Path
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Tuple, Union, Mapping
+from types import MappingProxyType
 from email.mime.text import MIMEText
 import sys
 import smtplib
-import tempfile
 import shutil
 import os
-import time
+import errno
+import fcntl
 import hashlib
+import json
+import mmap
 import re
 import tarfile
-from datetime import datetime
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import cached_property
+from string import Template
 from prompt_toolkit.application import Application
 from email_validator import validate_email, EmailNotValidError
 from prompt_toolkit.styles import Style
@@ -37,6 +45,113 @@ __license__ = "mit"
 sys.path.append("/rose/opt/infrastructure/repos/illumina")
 
 
+_looks_like_email = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+").fullmatch  # cheap prefilter
+_split_digits = re.compile(r"(\d+)").split
+
+
+def _natural_key(name: str) -> List[Union[int, str]]:
+    """
+    _natural_key returns a sort key that orders numbers in a name by value,
+    so that 'Alignment_10' comes after 'Alignment_9'.
+
+    Parameters
+    ----------
+    name : str
+        The name to sort.
+
+    Returns
+    -------
+    List[Union[int, str]]
+        Alternating text and number parts of name.
+    """
+    return [int(part) if part.isdigit() else part for part in _split_digits(name)]
+
+
+MESSAGE_SUBJECT = "Sequencing run finished"
+MESSAGE_FROM = "IMT Bioinformatics system <imtseq@imt.uni-marburg.de>"
+MESSAGE_TEMPLATE = Template("""
+Hi, a new Sequencing run has been completed for AG $ag at the Genomics Core Facility, ZTI, Marburg.
+
+You can download the data here:
+
+https://mbf.imt.uni-marburg.de/public/$filename.
+
+${checksum}sum=$md5sum
+
+Login credentials are:
+User=public
+password=public
+
+This link will expire in $maxdays days.
+
+Best of luck!
+    """)
+
+
+def _new_hash(algorithm: str, threads: int = None):
+    """
+    _new_hash returns a new hash object for the given algorithm.
+
+    Algorithms starting with 'xxh', e.g. 'xxh3_128', are taken from the
+    optional xxhash package, 'blake3' from the optional blake3 package
+    (multithreaded), all others from hashlib.
+
+    Parameters
+    ----------
+    algorithm : str
+        Name of the hash algorithm.
+    threads : int, optional
+        Maximum number of threads for blake3, by default as many as useful.
+
+    Returns
+    -------
+    A hash object with update and hexdigest methods.
+    """
+    if algorithm.startswith("xxh"):
+        import xxhash  # optional, pip install mgenomicsremotemail[xxhash]
+        return getattr(xxhash, algorithm)()
+    if algorithm == "blake3":
+        from blake3 import blake3  # optional, pip install mgenomicsremotemail[blake3]
+        return blake3(max_threads=threads or blake3.AUTO)
+    return hashlib.new(algorithm)
+
+
+class _HashingWriter:
+    """
+    _HashingWriter wraps a writable binary file and feeds every written chunk
+    into a hash, md5 by default.
+
+    This allows to create an archive and its checksum in a single pass
+    instead of reading the finished archive back from disk.
+    """
+
+    def __init__(self, fileobj, algorithm: str = "md5", threads: int = None):
+        """Constructor"""
+        self._fileobj = fileobj
+        self._hash = _new_hash(algorithm, threads)
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        return self._fileobj.write(data)
+
+    def tell(self) -> int:
+        return self._fileobj.tell()
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+    def hexdigest(self) -> str:
+        """
+        hexdigest returns the checksum of all data written so far.
+
+        Returns
+        -------
+        str
+            Checksum of the written data.
+        """
+        return self._hash.hexdigest()
+
+
 class RunDispatcher:
     """
     This is a RunDispatcher class that offers functionality to send
@@ -45,6 +160,13 @@ class RunDispatcher:
     This is supposed to be called via a restricted ssh login.
     """
     MAXDAYS = 14
+    CHUNKSIZE = 1024 * 1024  # buffer size for hashing, copying and archiving large files
+    MAX_RECIPIENTS = 50  # RCPT TO limit per SMTP transaction
+    MAX_WORKERS = 4  # number of run IDs dispatched concurrently
+    SCAN_WORKERS = 16  # number of threads for scanning folders on the network file system
+    ARCHIVE_SUFFIXES = {"gzip": ".tar.gz", "zstd": ".tar.zst", "none": ".tar"}  # by compressor
+    FASTQ_SUFFIXES = (".fastq", ".fastq.gz", ".fq", ".fq.gz")  # files to be archived
+    TEXT_COLORS = {False: "#000000", True: "#ff0000"}  # dialog text color by error state
 
     def __init__(self):
         """Constructor"""
@@ -53,9 +175,13 @@ class RunDispatcher:
         miseq_path = Path("/rose/ffs/incoming/MiSeq")
         self.public_path = Path("/mf/ffs/www/mbf_webroot/public")
         self.all_paths = [normal_path, nextseq_path, miseq_path]  # all paths where potenitally Sequencing runs can be found.
-        self.__collect_ids()
+        cache_home = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        self.cache_file = cache_home / "mgenomicsremotemail" / "run_ids.json"  # cached directory scans
+        self._run_ids = None  # collected on first access of run_ids
         self.host = "smtp.staff.uni-marburg.de"
         self.port = 0
+        self.smtp_user = os.environ.get("IMTSEQ_USER", "imtseq")
+        self._smtp_password = os.environ.get("IMTSEQ_PASS")  # never hard code this
         self.to_default_recipients = True  # Send outgoing email to us as well
         self.default_recipients = [
             "marco.mernberger@staff.uni-marburg.de",
@@ -63,6 +189,14 @@ class RunDispatcher:
             "katharina.humpert@uni-marburg.de"
         ]
         self.do_clean_up = True  # wehter to clean the public folder
+        self.compressor = "gzip"  # 'gzip' (.tar.gz), 'zstd' (.tar.zst) or 'none' (.tar)
+        self.compression_threads = self._get_available_cpus()  # used by pigz and zstd
+        self._archive_threads = None  # compression_threads split between concurrent dispatches
+        self.checksum = "md5"  # algorithm for the archive checksum, e.g. sha256, xxh3_128 or blake3
+        self._smtp = None  # open connection to the mail server, if any
+        self._keep_smtp = False  # keep the connection open after sending
+        self._smtp_lock = threading.Lock()  # the connection is shared between threads
+        self._input_folder_cache = {}  # fastq folders by (run folder, run ID)
 
     def __collect_ids(self) -> None:
         """
@@ -70,45 +204,250 @@ class RunDispatcher:
 
         This sets the field self._run_ids for all susequent methods and
         for convenience sets a list of (Run ID, fastq path) for all avbailable runs.
+        It is called on first access of RunDispatcher.run_ids, so dispatching
+        a known run ID does not need to scan all paths.
+        The scan results are cached in self.cache_file together with the
+        modification times of the scanned folders, so only paths that changed
+        since the last call are scanned again. Changed paths are scanned
+        concurrently.
         """
+        cache = self._load_id_cache()
+        outdated = [
+            path for path in self.all_paths
+            if str(path) not in cache or not self._is_up_to_date(cache[str(path)]["mtimes"])
+        ]
+        if len(outdated) > 0:
+            with ThreadPoolExecutor(max_workers=len(outdated)) as executor:
+                for path, scan in zip(outdated, executor.map(self._scan_run_path, outdated)):
+                    cache[str(path)] = scan
+            self._save_id_cache(cache)
         all_runs = {}
         for path in self.all_paths:
-            for item in path.iterdir():
-                if item.name[0].isdigit():
-                    if len(item.name) > 4:
-                        all_runs[item.name] = item
-                    elif len(item.name) == 4:
-                        for sub in item.iterdir():
-                            if sub.name[0].isdigit() and len(sub.name) > 4:
-                                all_runs[sub.name] = sub
+            for run_id, folder in cache[str(path)]["runs"].items():
+                all_runs[run_id] = Path(folder)
+        self._run_ids = all_runs
+        self.__dict__.pop("all_run_ids_and_folders_as_tuples", None)  # sorted again on next access
+
+    def _scan_run_path(self, path: Path) -> Dict[str, Dict[str, Union[int, str]]]:
+        """
+        _scan_run_path collects all run IDs in a single path.
+
+        Run folders are either located directly in path or in a sub folder
+        named after the year (4 digits). Year folders are scanned concurrently.
+
+        Parameters
+        ----------
+        path : Path
+            The path to scan.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Union[int, str]]]
+            A dict with the run folders by run ID ('runs') and the
+            modification times of all scanned folders ('mtimes').
+        """
+        mtimes = {str(path): path.stat().st_mtime_ns}
+        runs = {}
+        year_folders = []
+        with os.scandir(path) as it:
+            for item in it:
+                name = item.name
+                if name[:1].isdigit():
+                    if len(name) > 4:
+                        runs[name] = item.path
+                    elif len(name) == 4 and item.is_dir():  # d_type, no extra stat
+                        year_folders.append(item.path)
                     else:
                         pass  # pragma: no cover
-        self._run_ids = all_runs
-        self._all_run_ids_and_folders_as_tuples = [(x, x) for x in sorted(self._run_ids.keys(), reverse=True)]
+        if len(year_folders) > 0:
+            workers = min(self.SCAN_WORKERS, len(year_folders))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for folder, (mtime, year_runs) in zip(year_folders, executor.map(self._scan_year_folder, year_folders)):
+                    mtimes[folder] = mtime
+                    runs.update(year_runs)
+        return {"mtimes": mtimes, "runs": runs}
+
+    def _scan_year_folder(self, folder: str) -> Tuple[int, Dict[str, str]]:
+        """
+        _scan_year_folder collects all run IDs in a year folder.
+
+        Parameters
+        ----------
+        folder : str
+            The year folder to scan.
+
+        Returns
+        -------
+        Tuple[int, Dict[str, str]]
+            The modification time of the folder and the run folders by run ID.
+        """
+        mtime = os.stat(folder).st_mtime_ns
+        runs = {}
+        with os.scandir(folder) as it:
+            for sub in it:
+                name = sub.name
+                if len(name) > 4 and name[:1].isdigit():
+                    runs[name] = sub.path
+        return mtime, runs
+
+    def _is_up_to_date(self, mtimes: Dict[str, int]) -> bool:
+        """
+        _is_up_to_date checks if none of the scanned folders has been modified
+        since the scan.
+
+        Parameters
+        ----------
+        mtimes : Dict[str, int]
+            Modification times of the scanned folders at the time of the scan.
+
+        Returns
+        -------
+        bool
+            True, if the cached scan is still valid.
+        """
+        try:
+            return all(os.stat(folder).st_mtime_ns == mtime for folder, mtime in mtimes.items())
+        except OSError:
+            return False
+
+    def _load_id_cache(self) -> Dict[str, Dict]:
+        """
+        _load_id_cache returns the cached directory scans.
+
+        Returns
+        -------
+        Dict[str, Dict]
+            Cached scan results by scanned path, empty if there is no usable
+            cache.
+        """
+        try:
+            with self.cache_file.open() as inp:
+                return json.load(inp)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_id_cache(self, cache: Dict[str, Dict]) -> None:
+        """
+        _save_id_cache writes the directory scans to the cache file.
+
+        The cache is optional, so failing to write it is not an error. The
+        file is replaced atomically, so concurrent invocations never read a
+        partially written cache.
+
+        Parameters
+        ----------
+        cache : Dict[str, Dict]
+            Scan results by scanned path.
+        """
+        temp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(exist_ok=True, parents=True)
+            with temp_file.open("w") as op:
+                json.dump(cache, op)
+            os.replace(temp_file, self.cache_file)
+        except OSError:
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
 
     @property
-    def run_ids(self) -> Dict[str, Path]:
+    def run_ids(self) -> Mapping[str, Path]:
         """
         Getter for run_ids.
 
+        The known paths are scanned on first access. The mapping is read-only,
+        use RunDispatcher.refresh to scan again.
+
         Returns
         -------
-        Dict[str, Path]
-            A dict of run_ids to run folders.
+        Mapping[str, Path]
+            A read-only mapping of run_ids to run folders.
         """
-        return self._run_ids
+        if self._run_ids is None:
+            self.__collect_ids()
+        return MappingProxyType(self._run_ids)
 
-    @property
+    def _override_run_id(self, run_id: str, run_folder: Path) -> None:
+        """
+        _override_run_id sets the run folder for a run ID, e.g. for testing.
+
+        Parameters
+        ----------
+        run_id : str
+            The run ID.
+        run_folder : Path
+            The run folder to use for run_id.
+        """
+        if self._run_ids is None:
+            self.__collect_ids()
+        self._run_ids[run_id] = run_folder
+        self.__dict__.pop("all_run_ids_and_folders_as_tuples", None)
+
+    def refresh(self) -> None:
+        """
+        refresh discards the known run IDs and fastq folders.
+
+        The known paths are scanned again on the next access of
+        RunDispatcher.run_ids, which only rescans paths that changed.
+        """
+        self._run_ids = None
+        self.__dict__.pop("all_run_ids_and_folders_as_tuples", None)
+        self._input_folder_cache.clear()
+
+    def locate(self, run_id: str) -> Path:
+        """
+        locate returns the run folder for a given run ID.
+
+        Instead of scanning all known paths, this first looks for the run
+        folder in the year folder and directly in each path, in the same order
+        of precedence as the scan. Only if the run cannot be found there, all
+        paths are scanned. Run IDs are plain folder names, anything that
+        could point outside the run folders is rejected.
+
+        Parameters
+        ----------
+        run_id : str
+            The run ID to look up.
+
+        Returns
+        -------
+        Path
+            The run folder.
+
+        Raises
+        ------
+        ValueError
+            If the run id is not a plain folder name.
+        ValueError
+            If the run id is not known.
+        """
+        if Path(run_id).name != run_id or run_id in (".", ".."):
+            raise ValueError(f"Invalid run ID {run_id}.")
+        if self._run_ids is None and len(run_id) > 4 and run_id[:1].isdigit():
+            # later paths and year folders take precedence, as in __collect_ids
+            for path in reversed(self.all_paths):
+                for candidate in (path / f"20{run_id[:2]}" / run_id, path / run_id):
+                    if candidate.is_dir():
+                        return candidate
+        if run_id not in self.run_ids:
+            raise ValueError(f"Run {run_id} does not exist.")
+        return self.run_ids[run_id]
+
+    @cached_property
     def all_run_ids_and_folders_as_tuples(self) -> List[Tuple[str, Path]]:
         """
         Getter for all_run_ids_and_folders_as_tuples.
 
+        This is only needed for the interactive run ID dialog, so the list is
+        sorted on first access.
+
         Returns
         -------
         List[Tuple[str, Path]]
             A list of tuples (Run ID, fastq path) for all known runs.
         """
-        return self._all_run_ids_and_folders_as_tuples
+        return [(x, x) for x in sorted(self.run_ids.keys(), reverse=True)]
 
     def check_all_folders(self) -> str:
         """
@@ -116,30 +455,53 @@ class RunDispatcher:
         be found and the data it's supposed to be.
 
         This method can be called fgrom the command line tool vial the '--check'
-        option.
+        option. The folders are checked concurrently, the result is ordered
+        like RunDispatcher.run_ids.
 
         Returns
         -------
         str
             A string detailing the results for all checked run ids.
         """
-        result = "Checking all Run IDs:\n---------------------\n"
-        for run_id in self.run_ids:
-            try:
-                folder = self.get_input_folder(self.run_ids[run_id], run_id)
-                if not self.check_for_fastq(folder):
-                    result += f"{run_id}: is empty ({folder})\n"
-                else:
-                    result += f"{run_id}: is ok\n"
-            except PermissionError:
-                result += f"{run_id}: PermissionError for {folder}\n"
-            except ValueError as e:
-                if "No folder containing fastq files found in" in str(e):
-                    result += f"{run_id}: No fastq folder for {folder}\n"
-                else:
-                    print(run_id, self.run_ids[run_id], e)  # pragma: no cover
-                    raise   # pragma: no cover
-        return result
+        result = ["Checking all Run IDs:\n---------------------\n"]
+        run_ids = self.run_ids  # scan once, before the workers start
+        workers = max(1, min(self.SCAN_WORKERS, len(run_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            result.extend(executor.map(self._check_one, run_ids))
+        return "".join(result)
+
+    def _check_one(self, run_id: str) -> str:
+        """
+        _check_one checks for a single run ID wether fastq files can be found.
+
+        Parameters
+        ----------
+        run_id : str
+            The run ID to check.
+
+        Returns
+        -------
+        str
+            A line detailing the result for run_id.
+        """
+        run_folder = self.run_ids[run_id]
+        try:
+            folder = self.get_input_folder(run_folder, run_id)
+            if not self.check_for_fastq(folder):
+                return f"{run_id}: is empty ({folder})\n"
+            else:
+                return f"{run_id}: is ok\n"
+        except PermissionError:
+            return f"{run_id}: PermissionError for {run_folder}\n"
+        except FileNotFoundError:
+            # removed after the scan, do not abort the other checks
+            return f"{run_id}: Folder {run_folder} does not exist\n"
+        except ValueError as e:
+            if "No folder containing fastq files found in" in str(e):
+                return f"{run_id}: No fastq folder for {run_folder}\n"
+            else:
+                print(run_id, run_folder, e)  # pragma: no cover
+                raise   # pragma: no cover
 
     def print_check_all_folders(self) -> None:
         """
@@ -160,10 +522,7 @@ class RunDispatcher:
         str
             A string representation with all known ids.
         """
-        outstr = "Existing run ids:\n-----------------------\n"
-        for run_id in self.run_ids:
-            outstr += f"{run_id}\n"
-        return outstr
+        return "\n".join(["Existing run ids:", "-----------------------", *self.run_ids, ""])
 
     def print_run_ids(self) -> None:
         """
@@ -184,7 +543,7 @@ class RunDispatcher:
         filename : Path
             The base name of the output archive as a path (no parents).
         md5sum : str
-            The md5checksum of the archive file.
+            The checksum of the archive file, see RunDispatcher.checksum.
         recipients : List[str]
             A list of recipients email adresses.
         ag : str
@@ -195,35 +554,115 @@ class RunDispatcher:
         MIMEText
             The email message text.
         """
-        message = f"""
-Hi, a new Sequencing run has been completed for AG {ag} at the Genomics Core Facility, ZTI, Marburg.
+        message = MESSAGE_TEMPLATE.substitute(
+            ag=ag,
+            filename=filename,
+            checksum=self.checksum,
+            md5sum=md5sum,
+            maxdays=self.MAXDAYS,
+        )
+        msg = MIMEText(message)
+        msg["Subject"] = MESSAGE_SUBJECT
+        msg["From"] = MESSAGE_FROM
+        msg["To"] = ",".join(recipients)
+        return msg
+
+    def _get_available_cpus(self) -> int:
+        """
+        _get_available_cpus returns the number of CPUs this process may run on.
 
-You can download the data here:
+        This respects CPU affinity restrictions of the login session, which
+        os.cpu_count ignores.
+
+        Returns
+        -------
+        int
+            The number of usable CPUs.
+        """
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
 
-https://mbf.imt.uni-marburg.de/public/{filename}.
+    def _check_smtp_password(self) -> None:
+        """
+        _check_smtp_password checks that an SMTP password is set.
 
-md5sum={md5sum}
+        This is called before any archive is created, so a missing password
+        does not only show up after all archives are written.
 
-Login credentials are:
-User=public
-password=public
+        Raises
+        ------
+        ValueError
+            If no SMTP password is set.
+        """
+        if self._smtp_password is None:
+            raise ValueError("No SMTP password set, please set the environment variable IMTSEQ_PASS.")
 
-This link will expire in {self.MAXDAYS} days.
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        _get_smtp returns an authenticated connection to the mail server.
 
-Best of luck!
-    """
+        An already open connection is reused as long as it answers to NOOP,
+        otherwise a new connection is opened and logged in with the
+        credentials from the environment variables IMTSEQ_USER and IMTSEQ_PASS.
 
-        msg = MIMEText(message)
-        msg["Subject"] = "Sequencing run finished"
-        msg["From"] = "IMT Bioinformatics system <imtseq@imt.uni-marburg.de>"
-        msg["To"] = ",".join(recipients)
-        return msg
+        Returns
+        -------
+        smtplib.SMTP
+            The connection to the mail server.
+
+        Raises
+        ------
+        ValueError
+            If no SMTP password is set.
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp.close()
+        self._check_smtp_password()
+        s = smtplib.SMTP(self.host, self.port)
+        s.starttls()
+        s.login(self.smtp_user, self._smtp_password)
+        self._smtp = s
+        return s
 
-    def send_email(self, filename, md5sum, recipients, ag) -> Tuple[int, bytes]:
+    def _close_smtp(self) -> Union[None, Tuple[int, bytes]]:
+        """
+        _close_smtp closes the connection to the mail server, if one is open.
+
+        A connection that was already dropped by the server, e.g. while a
+        long archive was created, is closed without an error.
+
+        Returns
+        -------
+        Union[None, Tuple[int, bytes]]
+            The return value of the SMTP QUIT command or None, if no
+            connection was open.
+        """
+        if self._smtp is None:
+            return None
+        s = self._smtp
+        self._smtp = None
+        try:
+            return s.quit()
+        except smtplib.SMTPServerDisconnected:
+            s.close()
+            return None
+
+    def send_email(self, filename, md5sum, recipients, ag, bcc: List[str] = None) -> Union[None, Tuple[int, bytes]]:
         """
         send_email sends the email to all recipients.
 
-        This uses the MBF mail server to send the email.
+        This uses the MBF mail server to send the email. The message is built
+        once and sent in a single SMTP transaction to all recipients, split
+        only if there are more than RunDispatcher.MAX_RECIPIENTS. While a
+        batch of emails is sent from RunDispatcher.dispatch, the connection
+        is kept open and reused for all emails. If the server drops the
+        connection, it is reopened once.
 
         Parameters
         ----------
@@ -235,26 +674,93 @@ Best of luck!
             A list of recipients email adresses.
         ag : str
             The research group of the recipient.
+        bcc : List[str], optional
+            Additional recipients, which receive the email without being
+            listed in its To header.
 
         Returns
         -------
-        Tuple[int, bytes]
-            The return value of the SMTP QUIT command.
+        Union[None, Tuple[int, bytes]]
+            The return value of the SMTP QUIT command or None, if the
+            connection is kept open.
         """
         msg = self.generate_message(filename, md5sum, recipients, ag)
-        s = smtplib.SMTP(self.host, self.port)
-        s.starttls()
-        s.login("imtseq", "mwq!mrb6")
-        s.sendmail(msg["From"], recipients, msg.as_string())
-        res = s.quit()
-        return res
+        body = msg.as_string()
+        # blind copies are envelope recipients only, there is no Bcc header
+        envelope = list(dict.fromkeys(list(recipients) + list(bcc or [])))
+        with self._smtp_lock:
+            s = self._get_smtp()
+            # at least one transaction, so invalid recipients are still refused
+            for start in range(0, len(envelope) or 1, self.MAX_RECIPIENTS):
+                batch = envelope[start:start + self.MAX_RECIPIENTS]
+                try:
+                    s.sendmail(msg["From"], batch, body)
+                except smtplib.SMTPServerDisconnected:
+                    # dropped after the NOOP check, reconnect once
+                    s = self._get_smtp()
+                    s.sendmail(msg["From"], batch, body)
+            if self._keep_smtp:
+                return None
+            return self._close_smtp()
+
+    def send_batch(self, jobs: List[Tuple[str, str, List[str], str]]) -> Union[None, Tuple[int, bytes]]:
+        """
+        send_batch sends the emails for several archives over one connection.
 
-    def _targz(self, infolder: Path, public_archive: Path) -> None:
+        Jobs for the same archive, checksum and research group are merged,
+        so each distinct email is sent only once to the union of their
+        recipients. Only recipients common to all merged jobs are listed in
+        the To header, the others are sent blind copies, so no job's
+        recipients are disclosed to the recipients of another job.
+
+        Parameters
+        ----------
+        jobs : List[Tuple[str, str, List[str], str]]
+            The arguments of RunDispatcher.send_email for each email, as
+            (filename, md5sum, recipients, ag).
+
+        Returns
+        -------
+        Union[None, Tuple[int, bytes]]
+            The return value of the SMTP QUIT command or None, if the
+            connection is kept open.
+        """
+        merged = {}
+        for filename, md5sum, recipients, ag in jobs:
+            merged.setdefault((filename, md5sum, ag), []).append(recipients)
+        keep_smtp = self._keep_smtp
+        self._keep_smtp = True
+        try:
+            for (filename, md5sum, ag), recipient_lists in merged.items():
+                shown = [
+                    recipient for recipient in dict.fromkeys(recipient_lists[0])
+                    if all(recipient in recipients for recipients in recipient_lists[1:])
+                ]
+                bcc = [
+                    recipient for recipients in recipient_lists for recipient in recipients
+                    if recipient not in shown
+                ]
+                self.send_email(filename, md5sum, shown, ag, bcc)
+        finally:
+            self._keep_smtp = keep_smtp
+            quit_res = None if keep_smtp else self._close_smtp()
+        return quit_res
+
+    def _targz(self, infolder: Path, public_archive: Path, fastq_files: List[os.DirEntry] = None) -> str:
         """
         _targz creates the archive file with all fastq files to be send.
 
-        This uses tar and calls it via subrocess in the folder, where
-        the data is.
+        The compression is chosen by RunDispatcher.compressor. For 'gzip',
+        pigz is used to compress the archive on multiple cores if available,
+        otherwise tarfile's builtin gzip compression is used. If all files are
+        already gzipped, the fastest gzip level is used. For 'zstd',
+        the archive is compressed by zstd on multiple cores. For 'none',
+        the files are only stored, which is sufficient for .fastq.gz files.
+        The md5sum is calculated on the fly while the archive is written,
+        so the archive does not need to be read again afterwards, and is
+        stored in an md5sum file next to the archive. The archive is written
+        to a temporary file in the public folder and published by
+        RunDispatcher._publish when complete.
 
         Parameters
         ----------
@@ -262,21 +768,175 @@ Best of luck!
             The fastq folder.
         public_archive : [Path]
             The created archive.
+        fastq_files : List[os.DirEntry], optional
+            The fastq files to archive, as returned by
+            RunDispatcher._list_fastq. If None, infolder is scanned.
+
+        Returns
+        -------
+        str
+            md5 checksum of the created archive, or of the archive published
+            by a concurrent dispatch of the same run.
+        """
+        if fastq_files is None:
+            fastq_files = self._list_fastq(infolder)
+        # gzipped files do not get smaller with a higher level
+        gzip_level = 1 if all(entry.name.endswith(".gz") for entry in fastq_files) else 6
+        # written next to the public archive, so the final move is a rename,
+        # per process, so concurrent dispatches of the same run do not collide
+        temp_archive = public_archive.with_name(f"{public_archive.name}.{os.getpid()}.tmp")
+        print(temp_archive.resolve())
+        try:
+            with temp_archive.open("wb", buffering=self.CHUNKSIZE) as raw:
+                threads = self._archive_threads or self.compression_threads
+                writer = _HashingWriter(raw, self.checksum, threads)
+                pigz = shutil.which("pigz")
+                if self.compressor == "zstd":
+                    cmd = ["zstd", "-c", "-q", "-3", f"-T{threads}"]
+                    self._tar_compressed(cmd, fastq_files, writer)
+                elif self.compressor == "none":
+                    with tarfile.open(
+                        public_archive, mode="w", fileobj=writer, copybufsize=self.CHUNKSIZE
+                    ) as op:
+                        self._add_fastq(op, fastq_files)
+                elif pigz is None:
+                    # the final name goes into the gzip header, not the temporary one
+                    with tarfile.open(
+                        public_archive,
+                        mode="w:gz",
+                        fileobj=writer,
+                        compresslevel=gzip_level,
+                        copybufsize=self.CHUNKSIZE,
+                    ) as op:
+                        self._add_fastq(op, fastq_files)
+                else:
+                    cmd = [pigz, "-c", f"-{gzip_level}", "-p", str(threads)]
+                    self._tar_compressed(cmd, fastq_files, writer)
+            return self._publish(temp_archive, public_archive, writer.hexdigest())
+        except BaseException:
+            temp_archive.unlink(missing_ok=True)
+            raise
+
+    def _publish(self, temp_archive: Path, public_archive: Path, md5sum: str) -> str:
         """
-        temp_path_on_machine = Path("/machine/temp")
-        temp_path_on_machine.mkdir(exist_ok=True, parents=True)
-        with tempfile.TemporaryDirectory(dir=temp_path_on_machine) as tmp_dir:
-            temp_archive = Path(tmp_dir) / public_archive.name
-            print(temp_archive.resolve())
-            with tarfile.open(temp_archive, mode="w:gz") as op:
-                for source in infolder.iterdir():
-                    if ".fastq" in source.name and not source.is_dir():
-                        op.add(source, arcname=source.name)
-            self._move(str(temp_archive), str(public_archive))
+        _publish moves a finished archive to its public location and writes
+        the md5sum file next to it.
+
+        An exclusive lock is held while publishing, so concurrent dispatches
+        of the same run publish only one archive. If another process has
+        already published it, the new archive is discarded and the checksum
+        of the published one is returned, so all emails carry the checksum
+        of the file that can be downloaded.
+
+        Parameters
+        ----------
+        temp_archive : Path
+            The finished archive.
+        public_archive : Path
+            The public archive path.
+        md5sum : str
+            md5 checksum of temp_archive.
+
+        Returns
+        -------
+        str
+            md5 checksum of the published archive.
+        """
+        lock_file = public_archive.with_name(f".{public_archive.name}.lock")
+        with lock_file.open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file is closed
+            published = self._read_md5_file(public_archive) if public_archive.exists() else None
+            if published is not None:
+                temp_archive.unlink()
+                return published
+            self._move(temp_archive, public_archive)
+            self._write_md5_file(md5sum, public_archive)
+        return md5sum
+
+    def _tar_compressed(self, cmd: List[str], fastq_files: List[os.DirEntry], writer: _HashingWriter) -> None:
+        """
+        _tar_compressed writes an uncompressed tar stream to an external
+        compressor and the compressed output to writer.
+
+        The output of the compressor is consumed in a separate thread, so
+        that tar and compression run concurrently. If either side fails, the
+        compressor is killed, so the other side does not block on a full
+        pipe, and the error is raised.
+
+        Parameters
+        ----------
+        cmd : List[str]
+            The compressor command, reading from stdin and writing to stdout.
+        fastq_files : List[os.DirEntry]
+            The fastq files to archive.
+        writer : _HashingWriter
+            The archive file to write to.
+
+        Raises
+        ------
+        OSError
+            If writing the compressed output fails.
+        subprocess.CalledProcessError
+            If the compressor exits with a non-zero exit code.
+        """
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        reader_errors = []  # exception raised in the reader thread, if any
+
+        def copy_output():
+            try:
+                shutil.copyfileobj(proc.stdout, writer, self.CHUNKSIZE)
+            except BaseException as e:
+                reader_errors.append(e)
+                proc.kill()  # nobody drains the pipe anymore, unblock the tar side
+
+        reader = threading.Thread(target=copy_output)
+        reader.start()
+        tar_ok = False
+        try:
+            with tarfile.open(
+                mode="w|", fileobj=proc.stdin, bufsize=self.CHUNKSIZE, copybufsize=self.CHUNKSIZE
+            ) as op:
+                self._add_fastq(op, fastq_files)
+            tar_ok = True
+        finally:
+            if not tar_ok:
+                proc.kill()
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # the compressor is gone, the reason is raised below
+            reader.join()
+            proc.stdout.close()
+            returncode = proc.wait()
+            if reader_errors:
+                # the original error, not the broken pipe it caused on the tar side
+                raise reader_errors[0]
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+    def _add_fastq(self, op: tarfile.TarFile, fastq_files: List[os.DirEntry]) -> None:
+        """
+        _add_fastq adds the fastq files to the tar archive op.
+
+        Parameters
+        ----------
+        op : tarfile.TarFile
+            The opened tar archive.
+        fastq_files : List[os.DirEntry]
+            The fastq files to archive, in archive order.
+        """
+        for entry in fastq_files:
+            op.add(entry.path, arcname=entry.name)
 
     def _get_md5sum(self, path_2_file: Path) -> str:
         """
-        _get_md5sum calculates the md5sum of a file and returns it.
+        _get_md5sum calculates the checksum of a file and returns it.
+
+        This uses the hash algorithm set in RunDispatcher.checksum, md5 by
+        default. The file is memory mapped and hashed in a single call, so
+        the pages are read by the OS on demand and hashing runs without the
+        GIL. Files that can not be mapped are read in chunks into a reused
+        buffer instead.
 
         Parameters
         ----------
@@ -286,19 +946,98 @@ Best of luck!
         Returns
         -------
         str
-            md5 checksum of path_2_file.
+            Checksum of path_2_file.
+        """
+        md5_hash = _new_hash(self.checksum, self._archive_threads)
+        # unbuffered, readinto fills the buffer directly
+        with open(path_2_file, "rb", buffering=0) as inp:
+            try:
+                mm = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # empty files and some file systems can not be mapped
+                buffer = bytearray(self.CHUNKSIZE)
+                view = memoryview(buffer)
+                while size := inp.readinto(buffer):
+                    md5_hash.update(view[:size])
+            else:
+                with mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    md5_hash.update(mm)
+        return md5_hash.hexdigest()
+
+    def _get_md5_file(self, archive_file: Path) -> Path:
+        """
+        _get_md5_file returns the path of the md5sum file that belongs to an
+        archive.
+
+        Parameters
+        ----------
+        archive_file : Path
+            The archive file.
+
+        Returns
+        -------
+        Path
+            The md5sum file next to the archive.
+        """
+        return archive_file.with_name(f"{archive_file.name}.{self.checksum}")
+
+    def _write_md5_file(self, md5sum: str, archive_file: Path) -> None:
+        """
+        _write_md5_file stores the checksum of an archive next to it in the
+        format used by 'md5sum -c' and 'sha256sum -c'.
+
+        The file is replaced atomically, so a concurrent dispatch never reads
+        a partially written md5sum file.
+
+        Parameters
+        ----------
+        md5sum : str
+            md5 checksum of archive_file.
+        archive_file : Path
+            The archive file.
+        """
+        md5_file = self._get_md5_file(archive_file)
+        temp_file = md5_file.with_name(f"{md5_file.name}.{os.getpid()}.tmp")
+        try:
+            temp_file.write_text(f"{md5sum}  {archive_file.name}\n")
+            os.replace(temp_file, md5_file)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
+
+    def _read_md5_file(self, archive_file: Path) -> Union[None, str]:
         """
-        with path_2_file.open("rb") as inp:
-            md5_hash = hashlib.md5()
-            while chunk := inp.read(8192):
-                md5_hash.update(chunk)
-            md5sum = md5_hash.hexdigest()
+        _read_md5_file returns the md5sum stored next to an archive.
+
+        Parameters
+        ----------
+        archive_file : Path
+            The archive file.
+
+        Returns
+        -------
+        Union[None, str]
+            The stored md5sum or None, if there is no md5sum file or it can
+            not be parsed.
+        """
+        try:
+            content = self._get_md5_file(archive_file).read_text()
+        except FileNotFoundError:
+            return None
+        md5sum, _, name = content.partition("  ")
+        if not md5sum or name != f"{archive_file.name}\n":
+            return None  # empty or not written by RunDispatcher._write_md5_file
         return md5sum
 
     def _move(self, new_archive: str, public_archive: str) -> None:
         """
         _move moves a file new_archive to public_archive.
 
+        If both paths are on the same file system, this is a single atomic
+        rename. Only across file systems, shutil.move copies the file.
+
         Parameters
         ----------
         new_archive : str
@@ -306,7 +1045,12 @@ Best of luck!
         public_archive : str
             The destination path.
         """
-        shutil.move(new_archive, public_archive)
+        try:
+            os.replace(new_archive, public_archive)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(new_archive, public_archive)
 
     def check_for_fastq(self, path_2_files: Path) -> bool:
         """
@@ -321,19 +1065,54 @@ Best of luck!
         Returns
         -------
         bool
-            True, if at least one file name contains 'fastq' in its name.
+            True, if at least one fastq file is in the folder.
+        """
+        with os.scandir(path_2_files) as it:
+            # stop at the first match
+            return any(self._is_fastq(entry) for entry in it)
+
+    def _is_fastq(self, entry: os.DirEntry) -> bool:
+        """
+        _is_fastq checks whether a directory entry is a fastq file.
+
+        Parameters
+        ----------
+        entry : os.DirEntry
+            The directory entry to check.
+
+        Returns
+        -------
+        bool
+            True, if entry is not a folder and ends with one of
+            RunDispatcher.FASTQ_SUFFIXES.
+        """
+        return entry.name.endswith(self.FASTQ_SUFFIXES) and not entry.is_dir(follow_symlinks=False)
+
+    def _list_fastq(self, folder: Path) -> List[os.DirEntry]:
         """
-        for filepath in path_2_files.iterdir():
-            if ".fastq" in filepath.name:  # do not care if .fastq or .fastq.gz
-                return True
-        return False
+        _list_fastq returns the fastq files in folder, sorted by name.
+
+        Parameters
+        ----------
+        folder : Path
+            The fastq folder.
+
+        Returns
+        -------
+        List[os.DirEntry]
+            The directory entries of all fastq files in folder.
+        """
+        # sorted, so the archive layout does not depend on the listing order
+        with os.scandir(folder) as it:
+            return sorted((entry for entry in it if self._is_fastq(entry)), key=lambda entry: entry.name)
 
     def get_input_folder(self, run_folder: Path, run_id) -> Path:
         """
         get_input_folder returns the path to the fastq file for a given run ID.
 
         If no folder with fastq files can be found in the usual locations, this
-        returns None.
+        returns None. Results are cached per run folder, so the folder is only
+        looked up once for checking and dispatching.
 
         Parameters
         ----------
@@ -352,19 +1131,24 @@ Best of luck!
         ValueError
             If no folder with fastq files can be found in the run folder.
         """
+        key = (str(run_folder), run_id)
+        if key in self._input_folder_cache:
+            return self._input_folder_cache[key]
         path_2_files = None
         sub = run_folder
         if (run_folder / run_id).exists():
             sub = run_folder / run_id
-        alignments = []
-        for s in sub.iterdir():
-            if s.name.startswith("Alignment"):
-                alignments.append(s)
-        if len(alignments) > 0:
-            alignments = sorted(alignments, reverse=True)
-            for ss in alignments[0].iterdir():
-                path_2_files = ss / "Fastq"
-                break
+        with os.scandir(sub) as it:
+            latest_alignment = max(
+                (s for s in it if s.name.startswith("Alignment")),
+                key=lambda s: _natural_key(s.name),
+                default=None,
+            )
+        if latest_alignment is not None:
+            with os.scandir(latest_alignment.path) as it:
+                first = next(it, None)
+            if first is not None:
+                path_2_files = Path(first.path) / "Fastq"
         else:
             # this is the old stuff
             if (run_folder / "Unaligned").exists():
@@ -375,13 +1159,15 @@ Best of luck!
                 raise ValueError(f"No folder containing fastq files found in {str(run_folder)}")
         if path_2_files is None:
             raise ValueError(f"No folder containing fastq files found in {str(run_folder)}")
+        self._input_folder_cache[key] = path_2_files
         return path_2_files
 
     def clear_archive(self, md5sum: str, archive_file: Path) -> None:
         """
         clear_archive clears a file if it's md5sum does not check out.
 
-        This is used to remove failed archives.
+        This is used to remove failed archives. If the md5sum file written
+        alongside the archive matches, the archive is not hashed again.
 
         Parameters
         ----------
@@ -391,9 +1177,72 @@ Best of luck!
             the archive file.
         """
         if archive_file.exists():
+            if self._read_md5_file(archive_file) == md5sum:
+                return
             checksum = self._get_md5sum(archive_file)
             if checksum != md5sum:
                 archive_file.unlink()
+                self._get_md5_file(archive_file).unlink(missing_ok=True)
+
+    def _dispatch_one(self, run_id: str, ag: str, recipients: List[str]) -> Union[None, Tuple[int, bytes]]:
+        """
+        _dispatch_one creates the archive for a single run ID in the public
+        download folder and sends the automated email.
+
+        Parameters
+        ----------
+        run_id : str
+            The run ID to be dispatched.
+        ag : str
+            The research group of the main recipient.
+        recipients : List[str]
+            List of recipients which receive the email.
+
+        Returns
+        -------
+        Union[None, Tuple[int, bytes]]
+            The return value of RunDispatcher.send_email.
+
+        Raises
+        ------
+        ValueError
+            If no fastq folder can be found within the run folder.
+        ValueError
+            If no run folder can be found.
+        ValueError
+            If the run id is not known.
+        """
+        name = f"{run_id}_AG_{ag}"
+        suffix = self.ARCHIVE_SUFFIXES[self.compressor]
+        filename = f"{name}{suffix}"
+        public_archive = self.public_path / filename
+        md5sum = self._read_md5_file(public_archive) if public_archive.exists() else None
+        if md5sum is not None:
+            # archive and md5sum are already there, no need to look at the run
+            print(f"Archive {public_archive} already exists ...")
+            print("Dispatching emails ...")
+            return self.send_email(filename, md5sum, recipients, ag)
+        run_folder = self.locate(run_id)
+        if run_folder.exists():
+            path_2_files = self.get_input_folder(run_folder, run_id)
+            fastq_files = self._list_fastq(path_2_files)
+            if not fastq_files:
+                raise ValueError(f"Folder {str(path_2_files)} is empty for {run_id}")
+            else:
+                print(f"Collecting data from {path_2_files} ({len(fastq_files)} fastq files) ...")
+                # now we know the path to fastq files
+                if not public_archive.exists():
+                    print(f"Creating {suffix[1:]} ...")
+                    md5sum = self._targz(path_2_files, public_archive, fastq_files)
+                else:
+                    print(f"Archive {public_archive} already exists ...")
+                    print("Calculating md5sum ...")
+                    md5sum = self._get_md5sum(public_archive)
+                    self._write_md5_file(md5sum, public_archive)
+                print("Dispatching emails ...")
+                return self.send_email(filename, md5sum, recipients, ag)
+        else:
+            raise ValueError(f"Folder {run_folder} does not exist.")
 
     def dispatch(self, run_ids: List[str], ag: str, recipients: List[str]) -> Tuple[int, bytes]:
         """
@@ -401,7 +1250,9 @@ Best of luck!
         the public download folder and finally sends the automated email.
 
         This is the main functionality of the dispatcher which ties all the pre
-        steps together.
+        steps together. Run IDs are independent of each other and are processed
+        concurrently by up to RunDispatcher.MAX_WORKERS threads, which share
+        RunDispatcher.compression_threads.
 
         Parameters
         ----------
@@ -419,6 +1270,8 @@ Best of luck!
 
         Raises
         ------
+        ValueError
+            If no SMTP password is set.
         ValueError
             If no fastq folder can be found within the run folder.
         ValueError
@@ -426,83 +1279,84 @@ Best of luck!
         ValueError
             If the run id is not known.
         """
+        self._check_smtp_password()
         if self.to_default_recipients:
-            recipients.extend(self.default_recipients)
+            recipients = recipients + self.default_recipients  # do not modify the caller's list
+        recipients = list(dict.fromkeys(recipients))  # one email per recipient
+        run_ids = list(dict.fromkeys(run_ids))  # one archive per run ID
         res = -1, b"None"
-        for run_id in run_ids:
-            name = f"{run_id}_AG_{ag}"
-            if run_id in self.run_ids:
-                run_folder = self.run_ids[run_id]
-                if run_folder.exists():
-                    path_2_files = self.get_input_folder(run_folder, run_id)
-                    for x in path_2_files.iterdir():
-                        print(x)
-                    if not self.check_for_fastq(path_2_files):
-                        raise ValueError(f"Folder {str(path_2_files)} is empty for {run_id}")
-                    else:
-                        print(f"Collecting data from {path_2_files} ...")
-                        # now we know the path to fastq files
-                        filename = f"{name}.tar.gz"
-                        public_archive = self.public_path / filename
-                        if not public_archive.exists():
-                            print("Creating tar.gz ...")
-                            self._targz(path_2_files, public_archive)
-                        else:
-                            print(f"Archive {public_archive} already exists ...")
-                        print("Calculating md5sum ...")
-                        md5sum = self._get_md5sum(public_archive)
-                        print("Dispatching emails ...")
-                        res = self.send_email(filename, md5sum, recipients, ag)
-                else:
-                    raise ValueError(f"Folder {run_folder} does not exist.")
-            else:
-                raise ValueError(f"Run {run_id} does not exist.")
+        self._keep_smtp = True  # one connection for all emails
+        try:
+            if len(run_ids) > 0:
+                workers = min(self.MAX_WORKERS, len(run_ids))
+                # each concurrent archive gets its share of the CPUs
+                self._archive_threads = max(1, self.compression_threads // workers)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for result in executor.map(lambda run_id: self._dispatch_one(run_id, ag, recipients), run_ids):
+                        res = result
+        finally:
+            self._keep_smtp = False
+            self._archive_threads = None
+            quit_res = self._close_smtp()
+        if quit_res is not None:
+            res = quit_res
         return res
 
-    def get_ctime(self, filepath: Path) -> datetime:
+    def get_ctime(self, filepath: Union[Path, os.DirEntry]) -> datetime:
         """
         get_ctime returns the creation time of a file path as datetime.datetime
         object.
 
+        For an os.scandir entry, the stat result cached by the entry is used.
+
         Parameters
         ----------
-        filepath : Path
-            The file path to check.
+        filepath : Union[Path, os.DirEntry]
+            The file path or directory entry to check.
 
         Returns
         -------
         datetime
             The creation time of filepath.
         """
-        ctime = time.ctime(os.path.getmtime(str(filepath)))
-        filetime = datetime.strptime(ctime, "%a %b %d %H:%M:%S %Y")
-        return filetime
+        if isinstance(filepath, os.DirEntry):
+            return datetime.fromtimestamp(filepath.stat().st_mtime)
+        return datetime.fromtimestamp(os.path.getmtime(filepath))
 
     def _get_old_files(self) -> List[Path]:
         """
         _get_old_files returns a list of file path objects whose creation time
         exceeds the day limit specified in RunDispatcher.MAXDAYS.
 
+        The entries of os.scandir are passed to RunDispatcher.get_ctime, so
+        their cached stat results are used instead of a separate stat call
+        per file.
+
         Returns
         -------
         List[Path]
             List of file paths exceeding the day limit.
         """
-        current_time = datetime.now()
+        cutoff = datetime.now() - timedelta(days=self.MAXDAYS)
         to_clean = []
-        for filename in self.public_path.iterdir():
-            delta = current_time - self.get_ctime(filename)
-            if delta.days >= self.MAXDAYS:
-                to_clean.append(filename)
+        with os.scandir(self.public_path) as it:
+            for entry in it:
+                try:
+                    if self.get_ctime(entry) <= cutoff:
+                        to_clean.append(Path(entry.path))
+                except FileNotFoundError:
+                    pass  # removed while scanning
         return to_clean
 
     def cleanup(self) -> None:
         """
         cleanup purges all files from the public_path that exceeds the day limit
         as specified by RunDispatcher.MAXDAYS.
+
+        Files already removed by a concurrent cleanup are skipped.
         """
         for filename in self._get_old_files():
-            filename.unlink()
+            filename.unlink(missing_ok=True)
 
     def _get_run_id_app(self) -> Application:
         """
@@ -633,7 +1487,8 @@ Best of luck!
         the email adress format.
 
         This is used to check for invalid email adresses. If there are some,
-        the request will be repeated until all entries are valid.
+        the request will be repeated until all entries are valid. Only the
+        syntax is checked, the domains are not looked up in DNS.
 
         Parameters
         ----------
@@ -646,8 +1501,10 @@ Best of luck!
             Check result and error message to be used in the new request.
         """
         for email in recipients:
+            if not _looks_like_email(email):
+                return False, f"'{email}' is not a valid email."
             try:
-                validate_email(email)
+                validate_email(email, check_deliverability=False)
             except EmailNotValidError:
                 return False, f"'{email}' is not a valid email."
         return True, ""
@@ -669,11 +1526,7 @@ Best of luck!
         FormattedText
             Formatted text to be displayed in the input dialog.
         """
-        if red:
-            color = "#ff0000"
-        else:
-            color = "#000000"
-        return FormattedText([(color, text)])
+        return FormattedText([(self.TEXT_COLORS[bool(red)], text)])
 
     def request_emails(self) -> List[str]:
         """
@@ -709,7 +1562,13 @@ Best of luck!
         -------
         str
             Message to print at the end of excecution.
+
+        Raises
+        ------
+        ValueError
+            If no SMTP password is set.
         """
+        self._check_smtp_password()  # before asking for any input
         try:
             run_ids = self.request_run_ids()
         except SystemExit as e:
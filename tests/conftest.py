@@ -1,7 +1,18 @@
 # -*- coding: utf-8 -*-
 """conftest.py for mgenomicsremotemail."""
 import sys
+import pytest
 sys.path.append("/talizorah/mf/andrea_remote/mgenomicsremotemail/src")
+from mgenomicsremotemail.dispatch import RunDispatcher  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def shared_dispatcher():
+    """A RunDispatcher that scans the run folders only once per session.
+
+    Only use this in tests that do not modify the dispatcher.
+    """
+    return RunDispatcher()
 
 
 class MockApp():
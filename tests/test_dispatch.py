@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import os
+import errno
+import time
+import hashlib
 import tarfile
+import shutil
 import subprocess
 import smtplib
 from mgenomicsremotemail.dispatch import RunDispatcher
@@ -63,9 +68,11 @@ def test_init():
     assert isinstance(dispatcher.all_run_ids_and_folders_as_tuples, list)
 
 
-def test_ids():
-    dispatcher = RunDispatcher()
+def test_ids(shared_dispatcher):
+    dispatcher = shared_dispatcher
     assert len(dispatcher.run_ids) > 1
+    with pytest.raises(TypeError):
+        dispatcher.run_ids["12345_run"] = Path("non_existing_path")
     for run_id in dispatcher.run_ids:
         try:
             assert run_id[0].isdigit()
@@ -77,6 +84,63 @@ def test_ids():
             raise
 
 
+def test_collect_ids_cache(tmp_path):
+    dispatcher = RunDispatcher()
+    incoming = tmp_path / "incoming"
+    (incoming / "12345_run").mkdir(parents=True)
+    (incoming / "2021" / "21001_run").mkdir(parents=True)
+    (incoming / "2022").write_text("not a year folder")
+    dispatcher.all_paths = [incoming]
+    dispatcher.cache_file = tmp_path / "cache" / "run_ids.json"
+    dispatcher._RunDispatcher__collect_ids()
+    assert dispatcher.cache_file.exists()
+    assert [f.name for f in dispatcher.cache_file.parent.iterdir()] == ["run_ids.json"]
+    assert dispatcher.run_ids == {
+        "12345_run": incoming / "12345_run",
+        "21001_run": incoming / "2021" / "21001_run",
+    }
+    with patch("mgenomicsremotemail.dispatch.RunDispatcher._scan_run_path", side_effect=AssertionError):
+        dispatcher._RunDispatcher__collect_ids()
+    assert len(dispatcher.run_ids) == 2
+    new_run = incoming / "2021" / "21002_run"
+    new_run.mkdir()
+    os.utime(new_run.parent, ns=(0, 0))
+    dispatcher._RunDispatcher__collect_ids()
+    assert dispatcher.run_ids["21002_run"] == new_run
+    (incoming / "12346_run").mkdir()
+    os.utime(incoming, ns=(0, 0))
+    assert "12346_run" not in dispatcher.run_ids
+    assert ("12346_run", "12346_run") not in dispatcher.all_run_ids_and_folders_as_tuples
+    dispatcher.refresh()
+    assert dispatcher.run_ids["12346_run"] == incoming / "12346_run"
+    assert ("12346_run", "12346_run") in dispatcher.all_run_ids_and_folders_as_tuples
+
+
+def test_locate(tmp_path):
+    dispatcher = RunDispatcher()
+    incoming = tmp_path / "incoming"
+    (incoming / "12345_run").mkdir(parents=True)
+    (incoming / "2021" / "21001_run").mkdir(parents=True)
+    dispatcher.all_paths = [incoming]
+    dispatcher.cache_file = tmp_path / "cache" / "run_ids.json"
+    assert dispatcher.locate("12345_run") == incoming / "12345_run"
+    assert dispatcher.locate("21001_run") == incoming / "2021" / "21001_run"
+    assert dispatcher._run_ids is None
+    assert not dispatcher.cache_file.exists()
+    with pytest.raises(ValueError, match="Run 99999_run does not exist"):
+        dispatcher.locate("99999_run")
+    assert dispatcher.cache_file.exists()
+    for run_id in ["12345_run/../..", "12345/../../..", "/etc", "..", "."]:
+        with pytest.raises(ValueError, match="Invalid run ID"):
+            dispatcher.locate(run_id)
+    # a run in both places resolves to the year folder, scanned or not
+    (incoming / "21001_run").mkdir()
+    dispatcher.refresh()
+    assert dispatcher.locate("21001_run") == incoming / "2021" / "21001_run"
+    assert dispatcher.run_ids["21001_run"] == incoming / "2021" / "21001_run"
+    assert dispatcher.locate("21001_run") == incoming / "2021" / "21001_run"
+
+
 def test_check_for_fastq(tmp_path):
     dispatcher = RunDispatcher()
     path_2_files = tmp_path
@@ -86,6 +150,13 @@ def test_check_for_fastq(tmp_path):
     fastq.rename(path_2_files / "dummy.txt")
     assert not (path_2_files / "dummy.fastq").exists()
     assert not dispatcher.check_for_fastq(path_2_files)
+    (path_2_files / "dummy.fastq.md5").write_text("hi")
+    (path_2_files / "sub.fastq").mkdir()
+    assert not dispatcher.check_for_fastq(path_2_files)
+    assert dispatcher._list_fastq(path_2_files) == []
+    (path_2_files / "dummy.fq.gz").write_text("hi")
+    assert dispatcher.check_for_fastq(path_2_files)
+    assert [entry.name for entry in dispatcher._list_fastq(path_2_files)] == ["dummy.fq.gz"]
 
 
 def test_tar_gz(tmp_path):
@@ -99,6 +170,98 @@ def test_tar_gz(tmp_path):
     assert archive.exists()
     tf = tarfile.open(archive)
     assert fastq.name == tf.getmembers()[1].name
+    assert tf.getnames() == ["dummy1.fastq.gz", "dummy2.fastq.gz"]
+    md5_file = infolder / "test.tar.gz.md5"
+    assert md5_file.read_text() == f"{dispatcher._get_md5sum(archive)}  test.tar.gz\n"
+    assert dispatcher._read_md5_file(archive) == dispatcher._get_md5sum(archive)
+    assert not list(infolder.glob("*.tmp"))
+    for broken in ["", "\n", "d41d8", "1234  other.tar.gz\n"]:
+        md5_file.write_text(broken)
+        assert dispatcher._read_md5_file(archive) is None
+    archive.unlink()
+    with patch("shutil.which", return_value=None):  # tarfile writes the gzip header
+        dispatcher._targz(infolder, archive)
+    with archive.open("rb") as inp:
+        header = inp.read(10 + len("test.tar") + 1)
+    assert header[3] & 0x08  # FNAME set
+    assert header[10:] == b"test.tar\0"
+    with patch("mgenomicsremotemail.dispatch.RunDispatcher._add_fastq", side_effect=OSError):
+        with pytest.raises(OSError):
+            dispatcher._targz(infolder, tmp_path / "failed.tar.gz")
+    assert not list(infolder.glob("*.tmp"))
+    assert not (infolder / "failed.tar.gz").exists()
+
+
+def test_tar_gz_published_concurrently(tmp_path):
+    dispatcher = RunDispatcher()
+    fastq = tmp_path / "dummy.fastq.gz"
+    fastq.write_text("hi")
+    archive = tmp_path / "test.tar.gz"
+    archive.write_bytes(b"published")
+    dispatcher._write_md5_file("1234", archive)
+    # another process published the archive while this one was compressing
+    assert dispatcher._targz(tmp_path, archive) == "1234"
+    assert archive.read_bytes() == b"published"
+    assert not list(tmp_path.glob("*.tmp"))
+    archive.unlink()
+    md5sum = dispatcher._targz(tmp_path, archive)
+    assert md5sum == dispatcher._get_md5sum(archive) == dispatcher._read_md5_file(archive)
+
+
+def test_tar_store(tmp_path):
+    dispatcher = RunDispatcher()
+    dispatcher.compressor = "none"
+    fastq = tmp_path / "dummy.fastq.gz"
+    fastq.write_text("hi")
+    archive = tmp_path / "test.tar"
+    md5sum = dispatcher._targz(tmp_path, archive)
+    assert md5sum == dispatcher._get_md5sum(archive)
+    with tarfile.open(archive, mode="r:") as tf:
+        assert tf.getnames() == ["dummy.fastq.gz"]
+
+
+@pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd is not installed")
+def test_tar_zst(tmp_path):
+    dispatcher = RunDispatcher()
+    dispatcher.compressor = "zstd"
+    fastq = tmp_path / "dummy.fastq.gz"
+    fastq.write_text("hi")
+    archive = tmp_path / "test.tar.zst"
+    md5sum = dispatcher._targz(tmp_path, archive)
+    assert md5sum == dispatcher._get_md5sum(archive)
+    members = subprocess.check_output(["tar", "--zstd", "-tf", str(archive)]).decode().split()
+    assert members == ["dummy.fastq.gz"]
+
+
+def test_tar_compressed_failing_writer(tmp_path):
+    dispatcher = RunDispatcher()
+    fastq = tmp_path / "dummy.fastq"
+    fastq.write_bytes(os.urandom(8 * dispatcher.CHUNKSIZE))
+
+    class FailingWriter:
+        def __init__(self, limit):
+            self.written = 0
+            self.limit = limit
+
+        def write(self, data):
+            if self.written + len(data) > self.limit:
+                raise OSError(errno.ENOSPC, "No space left on device")
+            self.written += len(data)
+            return len(data)
+
+    fastq_files = dispatcher._list_fastq(tmp_path)
+    for limit in (dispatcher.CHUNKSIZE, 0):
+        with pytest.raises(OSError) as e:
+            dispatcher._tar_compressed(["cat"], fastq_files, FailingWriter(limit))
+        assert e.value.errno == errno.ENOSPC
+    archive = tmp_path / "test.tar.gz"
+    with patch.object(RunDispatcher, "_tar_compressed", side_effect=OSError(errno.EIO, "I/O error")):
+        with patch("shutil.which", return_value="pigz"):
+            with pytest.raises(OSError):
+                dispatcher._targz(tmp_path, archive)
+    assert not archive.exists()
+    assert not dispatcher._get_md5_file(archive).exists()
+    assert list(tmp_path.iterdir()) == [fastq]
 
 
 def test_get_md5sum(tmp_path):
@@ -106,11 +269,50 @@ def test_get_md5sum(tmp_path):
     infolder = tmp_path
     fastq = infolder / "dummy.fastq.gz"
     fastq.write_text("hi")
-    dispatcher._targz(infolder, tmp_path / "test.tar.gz")
+    sum0 = dispatcher._targz(infolder, tmp_path / "test.tar.gz")
     archive = infolder / "test.tar.gz"
     sum1 = dispatcher._get_md5sum(archive)
-    sum2 = subprocess.check_output(["md5sum", str(archive)]).decode().split()[0]
+    sum2 = hashlib.md5(archive.read_bytes()).hexdigest()
     assert sum1 == sum2
+    assert sum0 == sum2
+    dispatcher.checksum = "sha256"
+    archive.unlink()
+    sum0 = dispatcher._targz(infolder, archive)
+    sum2 = hashlib.sha256(archive.read_bytes()).hexdigest()
+    assert sum0 == sum2
+    assert dispatcher._get_md5sum(archive) == sum2
+    assert (infolder / "test.tar.gz.sha256").exists()
+    empty = infolder / "empty"
+    empty.touch()
+    assert dispatcher._get_md5sum(empty) == hashlib.sha256(b"").hexdigest()
+    with patch("mmap.mmap", side_effect=OSError):
+        assert dispatcher._get_md5sum(archive) == sum2
+
+
+def test_get_md5sum_xxhash(tmp_path):
+    xxhash = pytest.importorskip("xxhash")
+    dispatcher = RunDispatcher()
+    dispatcher.checksum = "xxh3_128"
+    fastq = tmp_path / "dummy.fastq.gz"
+    fastq.write_text("hi")
+    archive = tmp_path / "test.tar.gz"
+    md5sum = dispatcher._targz(tmp_path, archive)
+    assert md5sum == xxhash.xxh3_128(archive.read_bytes()).hexdigest()
+    assert dispatcher._get_md5sum(archive) == md5sum
+    assert dispatcher._read_md5_file(archive) == md5sum
+
+
+def test_get_md5sum_blake3(tmp_path):
+    blake3 = pytest.importorskip("blake3")
+    dispatcher = RunDispatcher()
+    dispatcher.checksum = "blake3"
+    fastq = tmp_path / "dummy.fastq.gz"
+    fastq.write_text("hi")
+    archive = tmp_path / "test.tar.gz"
+    md5sum = dispatcher._targz(tmp_path, archive)
+    assert md5sum == blake3.blake3(archive.read_bytes()).hexdigest()
+    assert dispatcher._get_md5sum(archive) == md5sum
+    assert (tmp_path / "test.tar.gz.blake3").exists()
 
 
 def test_get_input_folder(tmp_path):
@@ -137,6 +339,12 @@ def test_get_input_folder(tmp_path):
     assert folder == in4
     with pytest.raises(ValueError):
         dispatcher.get_input_folder(tmp_path, "12347")
+    with patch("os.scandir", side_effect=AssertionError):
+        assert dispatcher.get_input_folder(folder1, "12345") == in2
+    in5 = folder1 / "12345" / "Alignment_10" / "24444" / "Fastq"
+    in5.mkdir(parents=True)
+    dispatcher.refresh()
+    assert dispatcher.get_input_folder(folder1, "12345") == in5
 
 
 def test_clear_archive(tmp_path):
@@ -150,6 +358,14 @@ def test_clear_archive(tmp_path):
     dispatcher.clear_archive("1234", fastq)
     assert not fastq.exists()
     assert dispatcher.clear_archive("1234", Path("noarchive")) is None
+    fastq.write_text("hi")
+    dispatcher._write_md5_file("1234", fastq)
+    with patch("mgenomicsremotemail.dispatch.RunDispatcher._get_md5sum", side_effect=AssertionError):
+        dispatcher.clear_archive("1234", fastq)
+    assert fastq.exists()
+    dispatcher.clear_archive(sum + "0", fastq)
+    assert not fastq.exists()
+    assert not (tmp_path / "dummy.fastq.gz.md5").exists()
 
 
 def test_generate_message():
@@ -162,10 +378,13 @@ def test_generate_message():
     assert "AG AG" in msg._payload
     assert "md5sum=abc123" in msg._payload
     assert f"This link will expire in {dispatcher.MAXDAYS} days." in msg._payload
+    dispatcher.checksum = "sha256"
+    msg = dispatcher.generate_message("dummy.txt", "abc123", ["x.y@gmail.com"], "AG")
+    assert "sha256sum=abc123" in msg._payload
 
 
-def test_print_check_all_folders(capsys):
-    dispatcher = RunDispatcher()
+def test_print_check_all_folders(capsys, shared_dispatcher):
+    dispatcher = shared_dispatcher
     dispatcher.print_check_all_folders()
     captured = capsys.readouterr()
     assert "ok" in captured.out
@@ -175,17 +394,21 @@ def test_check_all_folders(capsys):
     dispatcher = RunDispatcher()
     res = dispatcher.check_all_folders()
     assert "ok" in res
+    run_id = next(iter(dispatcher.run_ids))
+    dispatcher._override_run_id(run_id, Path("non_existing_path"))
+    res = dispatcher.check_all_folders()
+    assert f"{run_id}: Folder non_existing_path does not exist\n" in res
 
 
-def test_print_run_ids(capsys):
-    dispatcher = RunDispatcher()
+def test_print_run_ids(capsys, shared_dispatcher):
+    dispatcher = shared_dispatcher
     dispatcher.print_run_ids()
     captured = capsys.readouterr().out
     assert len(captured.split("\n")) >= 10
 
 
-def test_get_run_ids():
-    dispatcher = RunDispatcher()
+def test_get_run_ids(shared_dispatcher):
+    dispatcher = shared_dispatcher
     run_id_str = dispatcher.get_run_ids_string()
     assert len(run_id_str.split("\n")) >= 10
 
@@ -311,6 +534,12 @@ def test_dispatch(capsys, tmp_path):
     pubpath = tmp_path / "dest"
     pubpath.mkdir()
     dispatcher.public_path = pubpath
+    dispatcher._smtp_password = None
+    with patch("mgenomicsremotemail.dispatch.RunDispatcher._targz") as targz:
+        with pytest.raises(ValueError, match="IMTSEQ_PASS"):
+            dispatcher.dispatch(["run_ids"], "ag", [])
+        targz.assert_not_called()
+    dispatcher._smtp_password = "secret"
     assert dispatcher.dispatch([], "", [])[0] == -1
     with pytest.raises(ValueError):
         dispatcher.dispatch(["run_ids"], "ag", [])
@@ -318,10 +547,10 @@ def test_dispatch(capsys, tmp_path):
     valid_run_id = next(iter(dispatcher.run_ids.keys()))
     empty_folder = tmp_path / "empty"
     empty_folder.mkdir()
-    dispatcher.run_ids[valid_run_id] = tmp_path
+    dispatcher._override_run_id(valid_run_id, tmp_path)
     with pytest.raises(ValueError, match=f"Run 12 does not exist"):
         dispatcher.dispatch(["12"], "ag", [dispatcher.default_recipients[0]])
-    dispatcher.run_ids["fake_id"] = Path("non_existing_path")
+    dispatcher._override_run_id("fake_id", Path("non_existing_path"))
     with pytest.raises(ValueError, match="Folder non_existing_path does not exist."):
         dispatcher.dispatch(["fake_id"], "ag", [dispatcher.default_recipients[0]])
     with pytest.raises(ValueError, match="No folder containing fastq files found in"):
@@ -345,12 +574,36 @@ def test_dispatch(capsys, tmp_path):
         res = dispatcher.dispatch([valid_run_id], "ag", [dispatcher.default_recipients[0]])
         captured = capsys.readouterr().out
         print(captured)
-        assert "Archive already exists" in captured
+        assert f"Archive {pubpath / f'{valid_run_id}_AG_ag.tar.gz'} already exists" in captured
+        assert "Collecting data" not in captured
         assert res[1] == "send called"
+        dispatcher.send_email = lambda *args: args[2]
+        dispatcher.to_default_recipients = True
+        recipients = [dispatcher.default_recipients[0], "x@gmail.com", "x@gmail.com"]
+        res = dispatcher.dispatch([valid_run_id], "ag", recipients)
+        assert res == [dispatcher.default_recipients[0], "x@gmail.com"] + dispatcher.default_recipients[1:]
+        assert len(recipients) == 3
+
+
+def test_dispatch_threads():
+    dispatcher = RunDispatcher()
+    dispatcher._smtp_password = "secret"
+    dispatcher.compression_threads = 8
+    threads = []
+    dispatcher._dispatch_one = lambda *args: threads.append(dispatcher._archive_threads)
+    dispatcher.dispatch(["1", "2", "3"], "ag", [])
+    assert threads == [2, 2, 2]
+    dispatcher.dispatch(["1"], "ag", [])
+    assert threads[-1] == 8
+    dispatcher.compression_threads = 1
+    dispatcher.dispatch(["1", "2"], "ag", [])
+    assert threads[-1] == 1
+    assert dispatcher._archive_threads is None
 
 
 def test_send_email():
     dispatcher = RunDispatcher()
+    dispatcher._smtp_password = "secret"
     dispatcher.to_default_recipients = False
     with pytest.raises(smtplib.SMTPRecipientsRefused):
         dispatcher.send_email("test.tar.gz", "1234", "", "TEST")
@@ -359,10 +612,67 @@ def test_send_email():
         assert res[0] == 221
 
 
+def test_send_email_reuses_connection():
+    dispatcher = RunDispatcher()
+    dispatcher.to_default_recipients = False
+    with pytest.raises(ValueError, match="IMTSEQ_PASS"):
+        dispatcher._smtp_password = None
+        dispatcher._get_smtp()
+    dispatcher._smtp_password = "secret"
+    with patch("smtplib.SMTP") as smtp:
+        smtp.return_value.noop.return_value = (250, b"OK")
+        smtp.return_value.quit.return_value = (221, b"Bye")
+        dispatcher._keep_smtp = True
+        for _ in range(2):
+            assert dispatcher.send_email("test.tar.gz", "1234", [dispatcher.default_recipients[0]], "TEST") is None
+        dispatcher._keep_smtp = False
+        assert dispatcher._close_smtp()[0] == 221
+        assert dispatcher._close_smtp() is None
+        assert smtp.call_count == 1
+        assert smtp.return_value.sendmail.call_count == 2
+        recipients = [f"x{ii}@gmail.com" for ii in range(dispatcher.MAX_RECIPIENTS + 1)]
+        dispatcher.send_email("test.tar.gz", "1234", recipients, "TEST")
+        assert smtp.return_value.sendmail.call_count == 4
+        smtp.return_value.sendmail.side_effect = [smtplib.SMTPServerDisconnected, {}]
+        smtp.return_value.noop.return_value = (421, b"Timeout")
+        dispatcher._keep_smtp = True
+        assert dispatcher.send_email("test.tar.gz", "1234", recipients[:1], "TEST") is None
+        assert smtp.return_value.sendmail.call_count == 6
+        assert smtp.call_count == 4
+        smtp.return_value.quit.side_effect = smtplib.SMTPServerDisconnected
+        assert dispatcher._close_smtp() is None
+        assert smtp.return_value.close.called
+
+
+def test_send_batch():
+    dispatcher = RunDispatcher()
+    dispatcher._smtp_password = "secret"
+    jobs = [
+        ("a.tar.gz", "1234", ["x@gmail.com"], "TEST"),
+        ("b.tar.gz", "5678", ["x@gmail.com"], "TEST"),
+        ("a.tar.gz", "1234", ["y@gmail.com", "x@gmail.com"], "TEST"),
+    ]
+    with patch("smtplib.SMTP") as smtp:
+        smtp.return_value.noop.return_value = (250, b"OK")
+        smtp.return_value.quit.return_value = (221, b"Bye")
+        assert dispatcher.send_batch(jobs)[0] == 221
+        assert smtp.call_count == 1
+        assert smtp.return_value.sendmail.call_count == 2
+        assert smtp.return_value.sendmail.call_args_list[0][0][1] == ["x@gmail.com", "y@gmail.com"]
+        body = smtp.return_value.sendmail.call_args_list[0][0][2]
+        assert "To: x@gmail.com\n" in body
+        assert "y@gmail.com" not in body
+        assert "Bcc" not in body
+        assert not dispatcher._keep_smtp
+
+
 def test_get_ctime():
     dispatcher = RunDispatcher()
     dt = dispatcher.get_ctime(Path(__file__))
     assert isinstance(dt, datetime)
+    with os.scandir(Path(__file__).parent) as it:
+        entry = next(e for e in it if e.name == Path(__file__).name)
+        assert dispatcher.get_ctime(entry) == dt
 
 
 def test_get_old_files():
@@ -374,6 +684,20 @@ def test_get_old_files():
         assert f in dispatcher._get_old_files()
 
 
+def test_get_old_files_cutoff(tmp_path):
+    dispatcher = RunDispatcher()
+    dispatcher.public_path = tmp_path
+    old = tmp_path / "old.tar.gz"
+    new = tmp_path / "new.tar.gz"
+    old.touch()
+    new.touch()
+    stamp = time.time() - (dispatcher.MAXDAYS * 86400 + 60)
+    os.utime(old, (stamp, stamp))
+    with patch("os.path.getmtime") as getmtime:
+        assert dispatcher._get_old_files() == [old]
+        getmtime.assert_not_called()  # scandir entries are used
+
+
 def test_cleanup(tmp_path):
     testfile = Path(tmp_path, "test")
     with testfile.open("w") as op:
@@ -384,6 +708,10 @@ def test_cleanup(tmp_path):
     assert testfile.exists()
     dispatcher.cleanup()
     assert not testfile.exists()
+    testfile.write_text("something")
+    with patch("mgenomicsremotemail.dispatch.RunDispatcher._get_old_files", return_value=[testfile, tmp_path / "gone"]):
+        dispatcher.cleanup()
+    assert not testfile.exists()
 
 
 def test_move(tmp_path):
@@ -396,16 +724,26 @@ def test_move(tmp_path):
     dispatcher._move(new_archive, public_archive)
     assert public_archive.exists()
     assert not new_archive.exists()
+    with patch("os.replace", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+        dispatcher._move(public_archive, new_archive)
+    assert new_archive.read_text() == "something"
+    assert not public_archive.exists()
 
 
 def test_get_formatted_text():
     dispatcher = RunDispatcher()
     assert isinstance(dispatcher._get_formatted_text("str", False), FormattedText)
     assert isinstance(dispatcher._get_formatted_text("str", False), FormattedText)
+    assert dispatcher._get_formatted_text("str", "yes") == dispatcher._get_formatted_text("str", True)
+    assert dispatcher._get_formatted_text("str", None) == dispatcher._get_formatted_text("str")
 
 
 def test_run():
     dispatcher = RunDispatcher()
+    dispatcher._smtp_password = None
+    with pytest.raises(ValueError, match="IMTSEQ_PASS"):
+        dispatcher.run()
+    dispatcher._smtp_password = "secret"
     dispatcher.dispatch = lambda *args: print("dispatch called")
     dispatcher.request_run_ids = lambda *args: print("request_run_ids called")
     dispatcher.request_emails = lambda *args: print("request_emails called")